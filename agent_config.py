@@ -4,61 +4,89 @@ Defines system instructions and agent initialization using the OpenAI Agents SDK
 Uses the knowledge/ directory for drop-in context about Daniel.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from agents import Agent
 
-from knowledge_loader import load_knowledge_dir
-from tools import lead_capture
+from knowledge_loader import (
+    KNOWLEDGE_DIR_NAME,
+    get_project_dir,
+    knowledge_dir_is_empty,
+    load_knowledge_index_cached,
+)
+from prompts import PERSONA, POLICY
+from tools import lead_capture, make_fetch_knowledge
 
-# ----- Base persona (used if no knowledge files) -----
+# ----- Base persona (always in the prompt; knowledge files add detail on demand) -----
 DEFAULT_BIO = """
 Daniel David is a CS student at Columbia University (class of 2026) and an ML Engineer at Rhino HealthTech.
 His work focuses on ML Security, Federated Learning, and NVFlare. He is professional, approachable, and witty.
 """
 
 
+def _format_knowledge_index(knowledge_dir: Optional[Path] = None) -> str:
+    """Bulleted list of knowledge files (name + one-line summary), or "" if there are none."""
+    lines = []
+    for entry in load_knowledge_index_cached(knowledge_dir):
+        if entry["summary"]:
+            lines.append(f"- {entry['name']}: {entry['summary']}")
+        else:
+            lines.append(f"- {entry['name']}")
+    return "\n".join(lines)
+
+
 def _build_instructions(knowledge_dir: Optional[Path] = None) -> str:
-    """Build system instructions, merging in content from the knowledge directory."""
-    knowledge_text = load_knowledge_dir(knowledge_dir)
-    if knowledge_text.strip():
-        persona_section = knowledge_text.strip()
+    """
+    Build system instructions: the base bio plus an index of the knowledge directory.
+    The agent pulls full file contents on demand with the fetch_knowledge tool.
+    """
+    if knowledge_dir_is_empty(knowledge_dir):
+        knowledge_index = ""
     else:
-        persona_section = DEFAULT_BIO.strip()
+        knowledge_index = _format_knowledge_index(knowledge_dir)
+    persona_section = DEFAULT_BIO.strip()
+    if knowledge_index:
+        persona_section += (
+            "\n\nFor anything beyond this summary, call fetch_knowledge with a file name below.\n"
+            f"{knowledge_index}"
+        )
 
-    return f"""You are the professional representative and gatekeeper for Daniel David.
+    return f"""{PERSONA}
 
-## Persona and knowledge about Daniel
+## Knowledge about Daniel
 {persona_section}
-Be professional, witty, and grounded. Represent Daniel in a way that feels human and helpful.
-Answer only from the information above or from general, public knowledge. Do not invent details.
 
-## What you must NOT do
-- Do NOT make up salary, compensation, or confidential project details.
-- Do NOT invent specific internal Rhino HealthTech or Columbia details you are unsure about.
-- Do NOT guess or hallucinate. If you are not confident, use the lead_capture tool.
-
-## When you cannot answer
-If the user asks for something you cannot answer from the given context (e.g. specific salary requirements,
-private project details, confidential info, or anything you are not authorized to share):
-1. Do NOT say "I don't know" and leave it there.
-2. Use the lead_capture tool: ask for their Name and Email, and record their specific question.
-3. Tell them you have recorded their inquiry and that Daniel will get back to them.
-4. Be warm and professional so they feel heard.
+{POLICY}
 """
 
 
+@lru_cache(maxsize=4)
+def _cached_agent(model: str, kdir: str) -> Agent:
+    """Build the agent once per (model, resolved knowledge dir)."""
+    knowledge_dir = Path(kdir)
+    return Agent(
+        name="DanielsRep",
+        instructions=_build_instructions(knowledge_dir),
+        tools=[lead_capture, make_fetch_knowledge(knowledge_dir)],
+        model=model,
+    )
+
+
 def create_agent(
     model_name: Optional[str] = None,
     knowledge_dir: Optional[Path] = None,
 ) -> Agent:
-    """Create the Professional Representative Agent with LeadCapture tool and Azure model."""
+    """
+    Create the Professional Representative Agent with LeadCapture/FetchKnowledge tools and Azure model.
+
+    Agents are cached by (model, resolved knowledge_dir): repeated calls return the same
+    instance, so treat it as immutable (don't mutate its tools or instructions). Files read
+    via fetch_knowledge still reflect the current knowledge dir; only the embedded
+    index is fixed when the agent is built.
+    """
     model = model_name or os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o-mini")
-    instructions = _build_instructions(knowledge_dir)
-    return Agent(
-        name="DanielsRep",
-        instructions=instructions,
-        tools=[lead_capture],
-        model=model,
-    )
+    if knowledge_dir is None:
+        knowledge_dir = get_project_dir() / KNOWLEDGE_DIR_NAME
+    return _cached_agent(model, str(knowledge_dir.resolve()))
@@ -3,13 +3,16 @@ Gradio UI for the Professional Representative Agent chatbot.
 Run: python app_gradio.py
 Then open the URL shown (e.g. http://127.0.0.1:7860).
 """
+import os
 import sys
 from pathlib import Path
+from typing import AsyncIterator
 
 import gradio as gr
 from agents import Runner, RunConfig
 from dotenv import load_dotenv
 from openai import APIConnectionError, APITimeoutError, NotFoundError
+from openai.types.responses import ResponseTextDeltaEvent
 
 from agent_config import create_agent
 from azure_utils import setup_azure_for_agents
@@ -32,25 +35,41 @@ def _init_agent():
     return agent
 
 
-async def chat(message: str, history: list) -> str:
+async def chat(message: str, history: list) -> AsyncIterator[str]:
     """
-    Gradio chat handler: takes user message and history, returns the assistant reply string.
+    Gradio chat handler: takes user message and history and streams the assistant reply,
+    yielding the accumulated text as tokens arrive.
     """
     global agent
     if not message or not message.strip():
-        return ""
+        yield ""
+        return
     try:
-        result = await Runner.run(
+        result = Runner.run_streamed(
             agent, message.strip(), run_config=RunConfig(tracing_disabled=True)
         )
-        return result.final_output or ""
+        acc = ""
+        new_paragraph = False
+        async for event in result.stream_events():
+            # Text written before and after a tool call belongs to separate model turns.
+            if event.type == "run_item_stream_event" and event.item.type == "tool_call_item":
+                new_paragraph = bool(acc)
+            # Only output-text deltas; tool-call argument deltas are not shown to the user.
+            elif event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                if new_paragraph:
+                    acc += "\n\n"
+                    new_paragraph = False
+                acc += event.data.delta
+                yield acc
+        if not acc:
+            yield result.final_output or ""
     except (NotFoundError, APIConnectionError, APITimeoutError) as e:
         err_msg = str(e)
         if "DeploymentNotFound" in err_msg or "deployment" in err_msg.lower():
             err_msg += "\n\nCheck AZURE_OPENAI_DEPLOYMENT_NAME in .env (Azure Portal → Model deployments)."
-        return f"Sorry, an error occurred: {err_msg}"
+        yield f"Sorry, an error occurred: {err_msg}"
     except Exception as e:
-        return f"Sorry, an error occurred: {str(e)}"
+        yield f"Sorry, an error occurred: {str(e)}"
 
 
 def main():
@@ -80,13 +99,21 @@ def main():
         ],
     )
 
+    # Let several chats run concurrently on the event loop (chat is an async generator).
+    # GRADIO_CONCURRENCY should roughly match the Azure deployment's parallel request quota.
+    demo.queue(
+        default_concurrency_limit=int(os.getenv("GRADIO_CONCURRENCY", "8")),
+        max_size=64,
+    )
+
     # 0.0.0.0 = listen on all interfaces (other devices can use your PC's IP:7860).
     # In your browser, use 127.0.0.1 or localhost — do not open http://0.0.0.0:7860.
     print("\n  Open in your browser: http://127.0.0.1:7860  (or http://localhost:7860)\n")
     demo.launch(
         server_name="0.0.0.0",
         server_port=7860,
-        share=True,
+        # Public *.gradio.live tunnel only when GRADIO_SHARE=1 (slower startup, extra hop).
+        share=os.getenv("GRADIO_SHARE", "0") == "1",
     )
 
 
@@ -2,16 +2,28 @@
 Azure OpenAI client setup for the OpenAI Agents SDK.
 Uses Azure-only env vars (not OPENAI_API_KEY). Same pattern as the main agents repo.
 The Agents SDK requires AsyncAzureOpenAI and chat_completions API mode for Azure.
+The client uses the process-wide httpx pool from http_pool.py.
 """
 import os
+from typing import Optional, Tuple
+
+import httpx
 from openai import AsyncAzureOpenAI
 from agents import set_default_openai_client, set_default_openai_api, set_tracing_export_api_key
 
+from http_pool import get_shared_httpx_client
+
+# Cached Azure client and the (api_key, endpoint, api_version, http pool) it was built with.
+_AZURE_CLIENT: Optional[AsyncAzureOpenAI] = None
+_AZURE_CLIENT_KEY: Optional[Tuple[str, str, str, httpx.AsyncClient]] = None
+
 
 def setup_azure_for_agents() -> str:
     """
-    Create AsyncAzureOpenAI client and set it as the default for the Agents SDK.
+    Create (or reuse) the AsyncAzureOpenAI client and set it as the default for the Agents SDK.
     Caller must load .env first (e.g. main.py loads from project dir).
+    The client is bound to the shared httpx pool of the loop it was set up from; call
+    this again if the Agents SDK is later driven from a different event loop.
     Azure supports Chat Completions only (not the Responses API).
     Returns the deployment name for use as the model parameter.
     """
@@ -36,11 +48,18 @@ def setup_azure_for_agents() -> str:
         # Match your deployment (cognitiveservices.azure.com); portal often uses 2024-12-01-preview
         api_version = "2024-12-01-preview"
 
-    client = AsyncAzureOpenAI(
-        api_key=api_key,
-        api_version=api_version,
-        azure_endpoint=endpoint,
-    )
+    global _AZURE_CLIENT, _AZURE_CLIENT_KEY
+    http_client = get_shared_httpx_client()
+    client_key = (api_key, endpoint, api_version, http_client)
+    if _AZURE_CLIENT is None or _AZURE_CLIENT_KEY != client_key:
+        _AZURE_CLIENT = AsyncAzureOpenAI(
+            api_key=api_key,
+            api_version=api_version,
+            azure_endpoint=endpoint,
+            http_client=http_client,
+        )
+        _AZURE_CLIENT_KEY = client_key
+    client = _AZURE_CLIENT
     # LLM calls use Azure. Tracing uploads to platform.openai.com and needs a direct OpenAI key.
     set_default_openai_client(client, use_for_tracing=False)
     openai_key = os.getenv("OPENAI_API_KEY")
@@ -11,16 +11,23 @@ This module:
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List, TypedDict
+from typing import Any, AsyncIterator, Dict, List, TypedDict
 
 from typing_extensions import Annotated
 
-from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, AIMessageChunk, AnyMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import add_messages
 
-from knowledge_loader import KNOWLEDGE_DIR_NAME, get_project_dir, load_knowledge_dir
+from http_pool import get_shared_httpx_client
+from knowledge_loader import (
+    KNOWLEDGE_DIR_NAME,
+    get_project_dir,
+    knowledge_dir_is_empty,
+    load_knowledge_cached,
+)
+from prompts import CHAT_POLICY, PERSONA
 
 
 def _append_leads(
@@ -58,6 +65,7 @@ _MODEL: ChatOpenAI | None = None
 def _get_chat_model() -> ChatOpenAI:
     """
     Construct (or reuse) a ChatOpenAI model using the standard OpenAI API.
+    Async calls go through the process-wide httpx pool from http_pool.
 
     Required env var:
       - OPENAI_API_KEY
@@ -66,7 +74,9 @@ def _get_chat_model() -> ChatOpenAI:
       - OPENAI_MODEL   e.g. gpt-4o, gpt-4o-mini
     """
     global _MODEL
-    if _MODEL is not None:
+    http_client = get_shared_httpx_client()
+    # Rebuild if the shared pool changed (e.g. requests now run on a new event loop).
+    if _MODEL is not None and _MODEL.http_async_client is http_client:
         return _MODEL
 
     api_key = os.getenv("OPENAI_API_KEY")
@@ -76,7 +86,11 @@ def _get_chat_model() -> ChatOpenAI:
         )
 
     model_name = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-    _MODEL = ChatOpenAI(api_key=api_key, model=model_name)
+    _MODEL = ChatOpenAI(
+        api_key=api_key,
+        model=model_name,
+        http_async_client=http_client,
+    )
     return _MODEL
 
 
@@ -94,58 +108,64 @@ def _build_system_prompt() -> str:
     """
     project_dir = get_project_dir()
     knowledge_dir = project_dir / KNOWLEDGE_DIR_NAME
-    knowledge_text = load_knowledge_dir(knowledge_dir).strip()
+    if knowledge_dir_is_empty(knowledge_dir):
+        persona_section = _DEFAULT_BIO
+    else:
+        knowledge_text = load_knowledge_cached(knowledge_dir).strip()
+        persona_section = knowledge_text if knowledge_text else _DEFAULT_BIO
 
-    persona_section = knowledge_text if knowledge_text else _DEFAULT_BIO
+    return f"""{PERSONA}
 
-    return f"""You are the professional representative and gatekeeper for Daniel David.
+## Knowledge about Daniel
+{persona_section}
 
-You must be:
-- Professional and clear.
-- Approachable and a bit witty when appropriate.
-- Grounded in factual information only.
+{CHAT_POLICY}""".strip()
 
-## Persona and knowledge about Daniel
-{persona_section}
 
-## Grounding and safety
-- Answer only from the information above or general, widely known public knowledge.
-- NEVER invent specific private details (salaries, confidential projects, internal company data).
-- If you are not confident you know the answer, you MUST avoid hallucinating.
+_SYSTEM_MSG: SystemMessage | None = None
 
-## When you don't know
-If you cannot answer with high confidence (because the question is too private, too specific,
-or not covered by your knowledge), follow this protocol:
-1. Politely say that you may not have enough verified information to answer with confidence.
-2. Ask the user to share their full name and email so Daniel can follow up personally.
-3. Briefly restate their question so they feel heard.
 
-Do NOT just say "I don't know" and stop. Always invite them to leave contact details so
-Daniel can respond directly when needed.
-""".strip()
+def _get_system_message() -> SystemMessage:
+    """Build the system prompt once per process and reuse the same SystemMessage."""
+    global _SYSTEM_MSG
+    if _SYSTEM_MSG is None:
+        _SYSTEM_MSG = SystemMessage(content=_build_system_prompt())
+    return _SYSTEM_MSG
 
 
 def _ensure_system_message(messages: List[AnyMessage]) -> List[AnyMessage]:
     """Ensure the first message is our system prompt."""
     if any(isinstance(m, SystemMessage) for m in messages):
         return messages
-    system = SystemMessage(content=_build_system_prompt())
-    return [system, *messages]
+    return [_get_system_message(), *messages]
 
 
-def agent_node(state: AgentState) -> Dict[str, Any]:
+async def agent_node(state: AgentState) -> Dict[str, Any]:
     """
     Single-node "brain" for now:
     - Injects system prompt if missing.
-    - Sends the message history to OpenAI.
+    - Sends the message history to OpenAI (async, so the event loop stays free).
     - Appends the assistant reply to `messages`.
     """
     model = _get_chat_model()
     messages = _ensure_system_message(state["messages"])
-    response: AIMessage = model.invoke(messages)
+    response: AIMessage = await model.ainvoke(messages)
     return {"messages": [response]}
 
 
+async def stream_agent(state: AgentState) -> AsyncIterator[AIMessageChunk]:
+    """
+    Streaming counterpart of `agent_node` for the SSE endpoint.
+
+    Calls the chat model's `astream` directly instead of going through
+    `GRAPH.astream_events`, which is much heavier for a single-node graph.
+    """
+    model = _get_chat_model()
+    messages = _ensure_system_message(state["messages"])
+    async for chunk in model.astream(messages):
+        yield chunk
+
+
 def build_agent_graph():
     """
     Construct the LangGraph workflow for this agent.
@@ -166,6 +186,9 @@ def build_agent_graph():
 # Pre-compiled graph for reuse by the FastAPI app.
 GRAPH = build_agent_graph()
 
+# Build the system prompt at import so the first request doesn't pay for it.
+_get_system_message()
+
 
 def initial_state_from_user_message(content: str) -> AgentState:
     """
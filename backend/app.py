@@ -9,13 +9,15 @@ Responsibilities:
 
 from __future__ import annotations
 
-import json
+import asyncio
+import os
 from pathlib import Path
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple
 
 import re
 from datetime import datetime, timezone
 
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -29,6 +31,7 @@ from .agent import (
     AgentState,
     initial_state_from_user_message,
     state_from_chat_history,
+    stream_agent,
 )  # noqa: E402
 
 
@@ -43,6 +46,93 @@ LEADS_FILE = LEADS_DIR / "leads.txt"
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 
 
+# ----- Request micro-batching (opt-in via BATCH_WINDOW_MS) -----
+BATCH_WINDOW_MS = int(os.getenv("BATCH_WINDOW_MS", "0"))
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "16"))
+
+
+class _GraphBatcher:
+    """
+    Coalesce concurrent `/api/chat` requests arriving within a short window and
+    dispatch them together with `asyncio.gather` over the shared HTTP pool.
+
+    Each caller awaits a Future that resolves to its own final AgentState.
+    The queue and drain task belong to one event loop; they are recreated when
+    requests arrive on a different loop (e.g. a new TestClient or a reload).
+    """
+
+    def __init__(self, window_ms: int, max_size: int) -> None:
+        self._window = window_ms / 1000.0
+        self._max_size = max(1, max_size)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[Tuple[AgentState, asyncio.Future]] | None = None
+        self._drain_task: asyncio.Task | None = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def submit(self, state: AgentState) -> AgentState:
+        """Queue `state` for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._queue is None:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._drain_task = None
+            self._inflight = set()
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = loop.create_task(self._drain(self._queue))
+        future: asyncio.Future = loop.create_future()
+        await self._queue.put((state, future))
+        return await future
+
+    async def _drain(self, queue: asyncio.Queue[Tuple[AgentState, asyncio.Future]]) -> None:
+        """
+        Collect up to `max_size` requests per window and hand each batch off.
+        If draining stops for any reason, every pending caller gets the error.
+        """
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[AgentState, asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self._window
+                while len(batch) < self._max_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                task = loop.create_task(self._dispatch(batch))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+                batch = []
+        except BaseException as exc:
+            error = exc if isinstance(exc, Exception) else RuntimeError("Chat batcher stopped.")
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+
+    async def _dispatch(self, batch: List[Tuple[AgentState, asyncio.Future]]) -> None:
+        """Run one batch concurrently and resolve each caller's Future."""
+        results = await asyncio.gather(
+            *(GRAPH.ainvoke(state) for state, _ in batch),
+            return_exceptions=True,
+        )
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+_BATCHER = _GraphBatcher(BATCH_WINDOW_MS, BATCH_MAX_SIZE) if BATCH_WINDOW_MS > 0 else None
+
+
 # ----- FastAPI app -----
 app = FastAPI(title="Professional AI Representative Backend", version="0.1.0")
 
@@ -153,6 +243,8 @@ async def chat(request: ChatRequest) -> ChatResponse:
 
     If `messages` is provided, we treat it as the full chat history (including
     the latest user turn). Otherwise we fall back to a single-turn `message`.
+
+    When BATCH_WINDOW_MS > 0, concurrent requests are coalesced by `_BATCHER`.
     """
     if request.messages:
         history_payload = [m.model_dump() for m in request.messages]
@@ -172,7 +264,10 @@ async def chat(request: ChatRequest) -> ChatResponse:
             _append_lead_line(lead_line)
     except Exception:
         pass
-    final_state: AgentState = GRAPH.invoke(state)
+    if _BATCHER is not None:
+        final_state: AgentState = await _BATCHER.submit(state)
+    else:
+        final_state = await GRAPH.ainvoke(state)
 
     ai_messages = [m for m in final_state["messages"] if isinstance(m, AIMessage)]
     if not ai_messages:
@@ -184,31 +279,35 @@ async def chat(request: ChatRequest) -> ChatResponse:
     )
 
 
-async def _sse_event_stream(initial_state: AgentState) -> AsyncGenerator[str, None]:
+# Pre-encoded terminal SSE event.
+_SSE_DONE = b'data: {"type":"done"}\n\n'
+
+
+def _sse_frame(payload: Dict[str, Any]) -> bytes:
+    """Encode one SSE `data:` frame (orjson writes bytes directly)."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+async def _sse_event_stream(initial_state: AgentState) -> AsyncGenerator[bytes, None]:
     """
-    Stream LangGraph events as Server-Sent Events (SSE).
+    Stream model token deltas as Server-Sent Events (SSE).
 
-    We focus on `on_chat_model_stream` events to emit token deltas.
+    Uses `stream_agent` (the chat model's `astream`) rather than LangGraph's
+    `astream_events`; `GRAPH` is still used by the non-streaming `/api/chat`.
     Errors are caught and forwarded as {"type": "error"} events so the
     frontend can display them instead of silently showing an empty bubble.
     """
     try:
-        async for event in GRAPH.astream_events(initial_state, version="v2"):
-            if event.get("event") == "on_chat_model_stream":
-                chunk = event.get("data", {}).get("chunk")
-                if not chunk:
-                    continue
-                delta = chunk.content
-                if not delta:
-                    continue
-                payload = {"type": "token", "delta": delta}
-                yield f"data: {json.dumps(payload)}\n\n"
+        async for chunk in stream_agent(initial_state):
+            delta = chunk.content
+            if not delta:
+                continue
+            yield _sse_frame({"type": "token", "delta": delta})
     except Exception as exc:
-        error_payload = {"type": "error", "message": str(exc)}
-        yield f"data: {json.dumps(error_payload)}\n\n"
+        yield _sse_frame({"type": "error", "message": str(exc)})
 
     # Signal completion to the client
-    yield f"data: {json.dumps({'type': 'done'})}\n\n"
+    yield _SSE_DONE
 
 
 @app.post("/api/chat/stream", tags=["chat"])
@@ -261,3 +360,18 @@ if FRONTEND_BUILD_DIR.is_dir():
         name="frontend",
     )
 
+
+if __name__ == "__main__":
+    # python -m backend.app  (the Procfile / railway.toml use the equivalent uvicorn CLI flags)
+    import uvicorn
+
+    uvicorn.run(
+        "backend.app:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        # "auto" picks uvloop / httptools (installed by uvicorn[standard]) when available
+        # and falls back to asyncio / h11 elsewhere (e.g. Windows has no uvloop).
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", "2")),
+    )
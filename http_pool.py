@@ -0,0 +1,45 @@
+"""
+Process-wide httpx connection pool shared by every LLM client
+(the Agents SDK's AsyncAzureOpenAI in azure_utils.py and the backend's ChatOpenAI).
+Kept dependency-free apart from httpx so the FastAPI backend doesn't pull in the Agents SDK.
+"""
+import asyncio
+from typing import Optional, Tuple
+
+import httpx
+
+# Shared async HTTP pool and the event loop it belongs to (None until first used inside a loop).
+# Keep-alive connections are tied to the loop that opened them, so each loop gets its own pool.
+_HTTPX: Optional[Tuple[Optional[asyncio.AbstractEventLoop], httpx.AsyncClient]] = None
+
+
+def get_shared_httpx_client() -> httpx.AsyncClient:
+    """
+    Return the httpx.AsyncClient for the running event loop, creating it on first use.
+    Pass it to any OpenAI/Azure client so they share one keep-alive connection pool.
+
+    A client created outside a loop is adopted by the first loop that asks for it; when
+    called from a different loop later (a second asyncio.run, a new TestClient, a reload)
+    a fresh client is returned. Callers that hold on to the client should compare it with
+    this function's result and rebuild when it changes.
+    """
+    global _HTTPX
+    try:
+        loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if _HTTPX is not None and not _HTTPX[1].is_closed:
+        owner, client = _HTTPX
+        if loop is None or owner is loop:
+            return client
+        if owner is None:
+            _HTTPX = (loop, client)
+            return client
+
+    client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=30,
+    )
+    _HTTPX = (loop, client)
+    return client
@@ -1,12 +1,27 @@
 """
 Load text from a designated directory (e.g. knowledge/) for the agent's context.
-Supports .txt, .md, and .pdf files; their contents are merged into the system prompt.
+Supports .txt, .md, and .pdf files. Either merge their full contents into the system
+prompt (load_knowledge_dir) or expose a lightweight index (load_knowledge_index) and
+read individual files on demand (load_knowledge_section). The *_cached variants reuse
+the last result persisted on disk while the files are unchanged (or unreadable).
 """
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from pypdf import PdfReader
 
+try:
+    import pypdfium2 as pdfium  # PDFium (C++) backend; much faster than pure-Python pypdf
+except ImportError:  # pragma: no cover - optional dependency
+    pdfium = None
+
 
 # Default folder name relative to the project root
 KNOWLEDGE_DIR_NAME = "knowledge"
@@ -16,55 +31,410 @@ TEXT_EXTENSIONS = {".txt", ".md", ".markdown"}
 PDF_EXTENSIONS = {".pdf"}
 ALL_EXTENSIONS = TEXT_EXTENSIONS | PDF_EXTENSIONS
 
+# Largest knowledge file we will open
+MAX_BYTES = 2_000_000
+
+# (path, size) of oversized files already reported, so each is logged only once
+_WARNED_OVERSIZED: Set[Tuple[str, int]] = set()
+
+# Upper bound on threads used to read changed files in parallel
+MAX_READ_WORKERS = 8
+
+logger = logging.getLogger(__name__)
+
+# PDFium is not thread-safe; serialize access when files are read from a thread pool.
+_PDFIUM_LOCK = threading.Lock()
+
+# How much of a text file to scan when building its index summary
+INDEX_SCAN_BYTES = 2048
+SUMMARY_MAX_CHARS = 200
+HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+# Per-file cache: path -> (mtime_ns, size, extracted text).
+_CACHE: Dict[Path, Tuple[int, int, str]] = {}
+
+# Index cache: path -> (mtime_ns, size, one-line summary).
+_INDEX_CACHE: Dict[Path, Tuple[int, int, str]] = {}
+
+# On-disk cache of the last good knowledge text/index (see load_knowledge_cached),
+# relative to the project root
+CACHE_FILE_NAME = ".knowledge_cache.json"
+_CACHE_FILE_LOCK = threading.Lock()
+
+# Bump whenever extraction/summary output changes (_summarize, HEADING_RE, MAX_BYTES, ...)
+# so values persisted by older code are not reused.
+CACHE_VERSION = 1
+
+# Joined-output cache: directory -> (directory fingerprint, concatenated text).
+_DIR_FP: Dict[Path, Tuple[int, str]] = {}
+
+
+def invalidate() -> None:
+    """Drop all cached knowledge text (used by tests and after manual edits)."""
+    _CACHE.clear()
+    _INDEX_CACHE.clear()
+    _DIR_FP.clear()
+
 
 def get_project_dir() -> Path:
     """Project root (directory containing main.py)."""
     return Path(__file__).resolve().parent
 
 
-def _read_pdf(path: Path) -> str:
-    """Extract text from a PDF file."""
-    reader = PdfReader(path)
-    parts = []
-    for page in reader.pages:
-        text = page.extract_text()
-        if text and text.strip():
-            parts.append(text.strip())
+def _read_pdf_pages_pdfium(path: Path, max_pages: Optional[int]) -> List[str]:
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(str(path))
+        try:
+            count = len(pdf) if max_pages is None else min(len(pdf), max_pages)
+            texts = []
+            for i in range(count):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                try:
+                    texts.append(textpage.get_text_range())
+                finally:
+                    textpage.close()
+                    page.close()
+            return texts
+        finally:
+            pdf.close()
+
+
+def _read_pdf_pages_pypdf(path: Path, max_pages: Optional[int]) -> List[str]:
+    pages = PdfReader(path).pages
+    if max_pages is not None:
+        pages = pages[:max_pages]
+    return [page.extract_text() or "" for page in pages]
+
+
+def _read_pdf(path: Path, max_pages: Optional[int] = None) -> str:
+    """Extract text from a PDF file (optionally only the first `max_pages` pages)."""
+    texts: Optional[List[str]] = None
+    if pdfium is not None:
+        try:
+            texts = _read_pdf_pages_pdfium(path, max_pages)
+        except Exception:
+            logger.info("PDFium could not read %s; falling back to pypdf", path.name, exc_info=True)
+    if texts is None:
+        try:
+            texts = _read_pdf_pages_pypdf(path, max_pages)
+        except Exception:
+            logger.warning("Could not extract text from %s", path.name, exc_info=True)
+            raise
+    parts = [text.strip() for text in texts if text and text.strip()]
     return "\n\n".join(parts) if parts else ""
 
 
-def load_knowledge_dir(knowledge_dir: Optional[Path] = None) -> str:
+def _resolve_dir(knowledge_dir: Optional[Path]) -> Path:
+    """Default to <project>/knowledge when no directory is given."""
+    if knowledge_dir is None:
+        return get_project_dir() / KNOWLEDGE_DIR_NAME
+    return knowledge_dir
+
+
+def knowledge_dir_is_empty(knowledge_dir: Optional[Path] = None) -> bool:
     """
-    Read all .txt, .md, and .pdf files in the given directory and return their
-    contents concatenated. If the directory doesn't exist or is empty, returns "".
+    True if the knowledge directory exists and has no entries at all. Only the first
+    entry is fetched, so this is cheap. A missing directory is *not* empty (callers
+    may still have a cached copy to serve).
     """
-    if knowledge_dir is None:
-        knowledge_dir = get_project_dir() / KNOWLEDGE_DIR_NAME
+    knowledge_dir = _resolve_dir(knowledge_dir)
+    try:
+        with os.scandir(knowledge_dir) as it:
+            return next(it, None) is None
+    except OSError:
+        return False
 
-    if not knowledge_dir.is_dir():
-        return ""
 
-    result_parts = []
-    for path in sorted(knowledge_dir.iterdir()):
-        if not path.is_file():
+def _dir_fingerprint(knowledge_dir: Path) -> int:
+    """
+    XOR of hash((name, mtime_ns, size)) over every directory entry, from a single
+    os.scandir pass. Order-independent, so no sorting or filtering is needed.
+    """
+    fp = 0
+    with os.scandir(knowledge_dir) as it:
+        for entry in it:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            fp ^= hash((entry.name, st.st_mtime_ns, st.st_size))
+    return fp
+
+
+def _list_knowledge_files(knowledge_dir: Path) -> List[Tuple[Path, int, int]]:
+    """
+    Return (path, mtime_ns, size) for every supported file, sorted by name.
+    The scan is not recursive (directories such as node_modules/ are never entered);
+    hidden entries and files larger than MAX_BYTES are skipped.
+    """
+    entries = []
+    with os.scandir(knowledge_dir) as it:
+        dir_entries = sorted(it, key=lambda e: e.name)
+    for entry in dir_entries:
+        name = entry.name
+        if name.startswith("."):
+            continue
+        try:
+            if not entry.is_file():
+                continue
+        except OSError:
             continue
-        suf = path.suffix.lower()
-        if suf not in ALL_EXTENSIONS:
+        if os.path.splitext(name)[1].lower() not in ALL_EXTENSIONS:
             continue
-        if path.name.upper() == "README.MD":
+        if name.upper() == "README.MD":
             continue
         try:
-            if suf in PDF_EXTENSIONS:
-                text = _read_pdf(path).strip()
-            else:
-                text = path.read_text(encoding="utf-8", errors="replace").strip()
-            if text:
-                result_parts.append(f"--- From {path.name} ---\n{text}")
+            st = entry.stat()
         except OSError:
             continue
-        except Exception:
+        if st.st_size > MAX_BYTES:
+            warned = (entry.path, st.st_size)
+            if warned not in _WARNED_OVERSIZED:
+                _WARNED_OVERSIZED.add(warned)
+                logger.warning(
+                    "Skipping %s: %d bytes exceeds knowledge file limit of %d", name, st.st_size, MAX_BYTES
+                )
             continue
+        entries.append((Path(entry.path), st.st_mtime_ns, st.st_size))
+    return entries
+
+
+def _read_text(path: Path) -> str:
+    """Read a UTF-8 text file as bytes and decode once (files are capped at MAX_BYTES)."""
+    return path.read_bytes().decode("utf-8", "replace")
+
+
+def _is_cached(path: Path, mtime: int, size: int) -> bool:
+    hit = _CACHE.get(path)
+    return hit is not None and hit[0] == mtime and hit[1] == size
+
+
+def _read_full(path: Path, mtime: int, size: int) -> Optional[str]:
+    """Full text of one knowledge file, served from _CACHE when unchanged. None on failure."""
+    if _is_cached(path, mtime, size):
+        return _CACHE[path][2]
+    try:
+        if path.suffix.lower() in PDF_EXTENSIONS:
+            text = _read_pdf(path).strip()
+        else:
+            text = _read_text(path).strip()
+    except OSError:
+        return None
+    except Exception:
+        return None
+    _CACHE[path] = (mtime, size, text)
+    return text
+
+
+def _summarize(text: str) -> str:
+    """One line built from the headings in `text`, or its first non-empty line."""
+    headings = [h.strip() for h in HEADING_RE.findall(text) if h.strip()]
+    if headings:
+        summary = "; ".join(headings)
+    else:
+        summary = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    summary = " ".join(summary.split())
+    if len(summary) > SUMMARY_MAX_CHARS:
+        summary = summary[: SUMMARY_MAX_CHARS - 3].rstrip() + "..."
+    return summary
+
+
+def _read_summary(path: Path, mtime: int, size: int) -> str:
+    """Cheap summary: headings from the first INDEX_SCAN_BYTES of text, or page 0 of a PDF."""
+    hit = _INDEX_CACHE.get(path)
+    if hit is not None and hit[0] == mtime and hit[1] == size:
+        return hit[2]
+    try:
+        if path.suffix.lower() in PDF_EXTENSIONS:
+            head = _read_pdf(path, max_pages=1)
+        else:
+            with path.open("rb") as f:
+                head = f.read(INDEX_SCAN_BYTES).decode("utf-8", errors="replace")
+    except OSError:
+        return ""
+    except Exception:
+        return ""
+    summary = _summarize(head)
+    _INDEX_CACHE[path] = (mtime, size, summary)
+    return summary
+
+
+def load_knowledge_index(knowledge_dir: Optional[Path] = None) -> List[Dict[str, str]]:
+    """
+    Return a lightweight index of the knowledge directory: one
+    {"name", "summary", "path"} dict per supported file. Only headings / the first
+    page are read, so full PDFs are not parsed. Returns [] if the directory is missing.
+    """
+    knowledge_dir = _resolve_dir(knowledge_dir)
+    if not knowledge_dir.is_dir() or knowledge_dir_is_empty(knowledge_dir):
+        return []
+
+    return [
+        {"name": path.name, "summary": _read_summary(path, mtime, size), "path": str(path)}
+        for path, mtime, size in _list_knowledge_files(knowledge_dir)
+    ]
 
-    if not result_parts:
+
+def load_knowledge_section(name: str, knowledge_dir: Optional[Path] = None) -> str:
+    """
+    Return the full text of the knowledge file called `name` (as listed by
+    load_knowledge_index). Returns "" if there is no such file or it can't be read.
+    """
+    knowledge_dir = _resolve_dir(knowledge_dir)
+    if not knowledge_dir.is_dir():
         return ""
-    return "\n\n".join(result_parts)
+
+    wanted = name.strip().lower()
+    for path, mtime, size in _list_knowledge_files(knowledge_dir):
+        if path.name.lower() == wanted:
+            return _read_full(path, mtime, size) or ""
+    return ""
+
+
+def load_knowledge_dir(knowledge_dir: Optional[Path] = None) -> str:
+    """
+    Read all .txt, .md, and .pdf files in the given directory and return their
+    contents concatenated. If the directory doesn't exist or is empty, returns "".
+
+    Extracted text is memoized per file by (mtime_ns, size), so only files that
+    changed since the last call are re-read; an unchanged directory returns the
+    previously joined string after a single os.scandir fingerprint pass.
+    """
+    knowledge_dir = _resolve_dir(knowledge_dir)
+    if not knowledge_dir.is_dir() or knowledge_dir_is_empty(knowledge_dir):
+        return ""
+
+    fingerprint = _dir_fingerprint(knowledge_dir)
+    cached = _DIR_FP.get(knowledge_dir)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    entries = _list_knowledge_files(knowledge_dir)
+
+    # Read changed files in parallel; ex.map keeps results in the (sorted) entry order.
+    stale = sum(1 for entry in entries if not _is_cached(*entry))
+    if stale > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, stale)) as ex:
+            texts = list(ex.map(lambda entry: _read_full(*entry), entries))
+    else:
+        texts = [_read_full(*entry) for entry in entries]
+
+    result_parts = []
+    for (path, _, _), text in zip(entries, texts):
+        if text:
+            result_parts.append(f"--- From {path.name} ---\n{text}")
+
+    joined = "\n\n".join(result_parts) if result_parts else ""
+    _DIR_FP[knowledge_dir] = (fingerprint, joined)
+    return joined
+
+
+def _read_cache_file(cache_path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_cache_entry(cache_path: Path, key: str, entry: Dict[str, Any]) -> None:
+    """Atomically update one entry of the JSON cache file (temp file + os.replace)."""
+    with _CACHE_FILE_LOCK:
+        data = _read_cache_file(cache_path)
+        data[key] = entry
+        fd, tmp = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, cache_path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+
+def _loader_id() -> str:
+    """Identifies the code that produced a cached value: CACHE_VERSION plus the active PDF backend."""
+    return f"v{CACHE_VERSION}:{'pdfium' if pdfium is not None else 'pypdf'}"
+
+
+def _stat_signature(knowledge_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    The loader id plus sorted [name, mtime_ns, size] for every knowledge file; stable
+    across processes (unlike hash()), so it can be stored on disk. None if the
+    directory can't be read.
+    """
+    if not knowledge_dir.is_dir():
+        return None
+    try:
+        files = [[path.name, mtime, size] for path, mtime, size in _list_knowledge_files(knowledge_dir)]
+    except OSError:
+        return None
+    return {"loader": _loader_id(), "files": files}
+
+
+def _load_with_disk_cache(
+    cache_path: Path, key: str, knowledge_dir: Path, compute: Callable[[], Any], default: Any
+) -> Any:
+    """
+    Return the value stored under `key` if its signature matches the directory's
+    current one, or if the directory can't be read (a stale copy beats nothing).
+    Otherwise compute it now and persist it with the new signature. Failures never
+    overwrite the stored copy; with nothing stored, `default` is returned.
+    """
+    entry = _read_cache_file(cache_path).get(key)
+    stored = entry if isinstance(entry, dict) and "signature" in entry and "value" in entry else None
+
+    signature = _stat_signature(knowledge_dir)
+    if signature is None:
+        logger.warning("Knowledge directory %s is unavailable; using cached copy", knowledge_dir)
+        return stored["value"] if stored is not None else default
+    if stored is not None and stored["signature"] == signature:
+        return stored["value"]
+
+    try:
+        value = compute()
+        if not knowledge_dir.is_dir():
+            # Vanished mid-load; the loaders return empty results instead of raising.
+            raise FileNotFoundError(knowledge_dir)
+    except Exception:
+        logger.warning("Could not load knowledge directory %s", knowledge_dir, exc_info=True)
+        return stored["value"] if stored is not None else default
+    try:
+        _write_cache_entry(cache_path, key, {"signature": signature, "value": value})
+    except OSError:
+        logger.warning("Could not write knowledge cache %s", cache_path, exc_info=True)
+    return value
+
+
+def _default_cache_path(cache_path: Optional[Path]) -> Path:
+    return cache_path if cache_path is not None else get_project_dir() / CACHE_FILE_NAME
+
+
+def load_knowledge_cached(
+    knowledge_dir: Optional[Path] = None, cache_path: Optional[Path] = None
+) -> str:
+    """
+    load_knowledge_dir backed by a JSON file at `cache_path`. The stored text is reused
+    while the files' (name, mtime_ns, size) signature is unchanged, and is served as a
+    fallback when the knowledge directory can't be read, so startup never depends on it.
+    """
+    knowledge_dir = _resolve_dir(knowledge_dir)
+    key = f"text:{knowledge_dir.resolve()}"
+    return _load_with_disk_cache(
+        _default_cache_path(cache_path), key, knowledge_dir, lambda: load_knowledge_dir(knowledge_dir), ""
+    )
+
+
+def load_knowledge_index_cached(
+    knowledge_dir: Optional[Path] = None, cache_path: Optional[Path] = None
+) -> List[Dict[str, str]]:
+    """load_knowledge_index backed by the same JSON cache (see load_knowledge_cached)."""
+    knowledge_dir = _resolve_dir(knowledge_dir)
+    key = f"index:{knowledge_dir.resolve()}"
+    return _load_with_disk_cache(
+        _default_cache_path(cache_path), key, knowledge_dir, lambda: load_knowledge_index(knowledge_dir), []
+    )
@@ -5,6 +5,7 @@ Uses Azure OpenAI via azure_utils and the OpenAI Agents SDK.
 import asyncio
 import sys
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple
 
 from agents import Runner, RunConfig
 from dotenv import load_dotenv
@@ -35,10 +36,10 @@ AZURE_PORTAL_NOTE = (
 )
 
 
-def _maybe_add_azure_note(err: Exception) -> str:
+def _maybe_add_azure_note(msg: str) -> str:
     """If the error message points to OpenAI's platform, append a note that we use Azure."""
-    msg = str(err)
-    if "platform.openai" in msg.lower() or "openai.com" in msg.lower():
+    low = msg.lower()
+    if "platform.openai" in low or "openai.com" in low:
         return msg + AZURE_PORTAL_NOTE
     return msg
 
@@ -52,6 +53,28 @@ DeploymentNotFound (404): AZURE_OPENAI_DEPLOYMENT_NAME in .env doesn't match any
 """
 
 
+# (lowercase substring, help text factory) pairs; the first match wins.
+HelpTable = List[Tuple[str, Callable[[], str]]]
+
+# "deployment" also covers DeploymentNotFound.
+NOT_FOUND_HELP: HelpTable = [
+    ("deployment", _deployment_not_found_help),
+]
+
+ERROR_HELP: HelpTable = [
+    ("deploymentnotfound", _deployment_not_found_help),
+    ("404", _deployment_not_found_help),
+]
+
+
+def _help_for(low: str, table: HelpTable) -> Optional[str]:
+    """Return help text for the first table entry whose substring occurs in `low`."""
+    for needle, help_fn in table:
+        if needle in low:
+            return help_fn()
+    return None
+
+
 async def run_chat():
     """Initialize Azure, create agent, and run a simple async chat loop."""
     load_dotenv(_PROJECT_DIR / ".env", override=True)
@@ -67,7 +90,7 @@ async def run_chat():
         print("Make sure .env uses Azure vars: AZURE_OPENAI_API_KEY, AZURE_OPENAI_ENDPOINT (not OPENAI_API_KEY).", file=sys.stderr)
         sys.exit(1)
     except (APIConnectionError, APITimeoutError, OSError) as e:
-        print("Startup failed:", _maybe_add_azure_note(e), file=sys.stderr)
+        print("Startup failed:", _maybe_add_azure_note(str(e)), file=sys.stderr)
         print(_connection_error_help(), file=sys.stderr)
         sys.exit(1)
 
@@ -91,18 +114,18 @@ async def run_chat():
             print("\nGoodbye.")
             break
         except NotFoundError as e:
-            print(f"Error: {_maybe_add_azure_note(e)}")
-            if "DeploymentNotFound" in str(e) or "deployment" in str(e).lower():
-                print(_deployment_not_found_help())
-            else:
-                print(_connection_error_help())
+            msg = str(e)
+            print(f"Error: {_maybe_add_azure_note(msg)}")
+            print(_help_for(msg.lower(), NOT_FOUND_HELP) or _connection_error_help())
         except (APIConnectionError, APITimeoutError) as e:
-            print(f"Connection error: {_maybe_add_azure_note(e)}")
+            print(f"Connection error: {_maybe_add_azure_note(str(e))}")
             print(_connection_error_help())
         except Exception as e:
-            print(f"Error: {_maybe_add_azure_note(e)}")
-            if "DeploymentNotFound" in str(e) or "404" in str(e):
-                print(_deployment_not_found_help())
+            msg = str(e)
+            print(f"Error: {_maybe_add_azure_note(msg)}")
+            help_text = _help_for(msg.lower(), ERROR_HELP)
+            if help_text:
+                print(help_text)
             print()
 
 
@@ -1,9 +1,13 @@
 """
-Tools for the Professional Representative Agent: SendGrid email and Lead Capture.
+Tools for the Professional Representative Agent: SendGrid email, Lead Capture, and
+on-demand knowledge retrieval.
 Uses Pydantic for LeadCapture schema and @function_tool for the Agents SDK.
 """
+import html
 import os
-from typing import Dict
+import string
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 import sendgrid
 from pydantic import BaseModel, Field
@@ -11,6 +15,8 @@ from sendgrid.helpers.mail import Content, Email, Mail, To
 
 from agents import function_tool
 
+from knowledge_loader import load_knowledge_section
+
 
 # ----- Pydantic schema for lead capture -----
 class LeadCapture(BaseModel):
@@ -21,6 +27,30 @@ class LeadCapture(BaseModel):
     question: str = Field(description="The specific question or topic they asked that could not be answered.")
 
 
+# Lead notification body; values are HTML-escaped before substitution.
+_LEAD_TMPL = string.Template(
+    """
+    <h2>New lead from Professional Rep Bot</h2>
+    <p><strong>Name:</strong> $name</p>
+    <p><strong>Email:</strong> $email</p>
+    <p><strong>Question / topic:</strong></p>
+    <blockquote>$question</blockquote>
+    """
+)
+
+# SendGrid client reused across sends (keeps its HTTP session), keyed by API key.
+# Built lazily because .env is loaded after this module is imported.
+_SG: Optional[Tuple[str, sendgrid.SendGridAPIClient]] = None
+
+
+def _get_sendgrid_client(api_key: str) -> sendgrid.SendGridAPIClient:
+    """Return the shared SendGrid client, rebuilding it only if the API key changed."""
+    global _SG
+    if _SG is None or _SG[0] != api_key:
+        _SG = (api_key, sendgrid.SendGridAPIClient(api_key=api_key))
+    return _SG[1]
+
+
 def send_html_email(subject: str, html_body: str) -> Dict[str, str]:
     """
     Send an HTML email via SendGrid. Used to notify Daniel of captured leads.
@@ -34,7 +64,7 @@ def send_html_email(subject: str, html_body: str) -> Dict[str, str]:
     to_email = os.environ.get("EMAIL_TO", "daniel@example.com")
 
     try:
-        sg = sendgrid.SendGridAPIClient(api_key=api_key)
+        sg = _get_sendgrid_client(api_key)
         mail = Mail(
             from_email=Email(from_email),
             to_emails=To(to_email),
@@ -61,14 +91,37 @@ def lead_capture(name: str, email: str, question: str) -> Dict[str, str]:
     payload = LeadCapture(name=name, email=email, question=question)
 
     subject = f"[Lead] {payload.name} – {payload.question[:50]}..."
-    html_body = f"""
-    <h2>New lead from Professional Rep Bot</h2>
-    <p><strong>Name:</strong> {payload.name}</p>
-    <p><strong>Email:</strong> {payload.email}</p>
-    <p><strong>Question / topic:</strong></p>
-    <blockquote>{payload.question}</blockquote>
-    """
+    html_body = _LEAD_TMPL.substitute(
+        name=html.escape(payload.name),
+        email=html.escape(payload.email),
+        question=html.escape(payload.question),
+    )
     result = send_html_email(subject=subject, html_body=html_body)
     if result.get("status") == "sent":
         return {"status": "ok", "message": "Inquiry recorded; Daniel will be notified."}
     return {"status": "error", "message": result.get("message", "Failed to send notification.")}
+
+
+def make_fetch_knowledge(knowledge_dir: Optional[Path] = None):
+    """
+    Build a fetch_knowledge tool bound to `knowledge_dir` (default: <project>/knowledge),
+    so the tool reads from the same directory the agent's knowledge index was built from.
+    """
+
+    @function_tool
+    def fetch_knowledge(name: str) -> str:
+        """
+        Read the full contents of one knowledge file about Daniel. Use the exact file name from
+        the list of available knowledge files in your instructions (e.g. "resume.pdf").
+        Call this before answering questions about Daniel's background, experience, or projects.
+        """
+        text = load_knowledge_section(name, knowledge_dir)
+        if not text:
+            return f"No knowledge file named '{name}' was found."
+        return text
+
+    return fetch_knowledge
+
+
+# Tool for the default knowledge directory.
+fetch_knowledge = make_fetch_knowledge()